@@ -16,21 +16,26 @@
 # along with this program; if not, write to the Free Software
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
 # MA  02110-1301, USA.
+import functools
 import re
+import sys
+import types
 
 # Column titles that represent another layer of indexing
 # i.e. timestamp -> index -> another column -> datum
-INDEX_COLUMN = {
-    "CPU",
-    "IFACE",
-    "DEV",
-    "INTR",
-    "FAN",
-    "TEMP",
-    "BUS",
-    "FILESYSTEM",
-    "TTY",
-}
+INDEX_COLUMN = frozenset(
+    {
+        "CPU",
+        "IFACE",
+        "DEV",
+        "INTR",
+        "FAN",
+        "TEMP",
+        "BUS",
+        "FILESYSTEM",
+        "TTY",
+    }
+)
 
 # Regular expressions to recognise various types of data found in sar
 # files, to be used as building blocks.
@@ -41,20 +46,35 @@ INDEX_COLUMN = {
 TIMESTAMP_RE = r"\d{2}:\d{2}:\d{2}(?:\sAM|\sPM)?"
 INTEGER_RE = r"[+-]?\d+"
 HEX_RE = r"[a-fA-F0-9]+"
-NUMBER_WITH_DEC_RE = r"(?:[+-]?\d+\.\d+|nan)"
+# The ordering of the alternation matters: "nan" is a plain literal that
+# fails on the first character for any number, so the engine never has to
+# backtrack out of the numeric branch to try it
+NUMBER_WITH_DEC_RE = r"(?:nan|[+-]?\d+\.\d+)"
 INTERFACE_NAME_RE = r"[^ \t]+"
 USB_NAME_RE = r"[^\t]+"
 FS_NAME_RE = r"[^\t]+"
 DEVICE_NAME_RE = INTERFACE_NAME_RE
-INTERRUPTS_RE = r"(?:" + NUMBER_WITH_DEC_RE + "|N/A)"
+# Same here: the literal goes first so it is rejected on its first character
+INTERRUPTS_RE = r"(?:N/A|" + NUMBER_WITH_DEC_RE + ")"
 CPU_RE = r"(?:all|\d+)"
 INT_RE = r"(?:sum|\d+)"
 
+# Units of the graphs, as shown on the y axis. Entries share these objects
+# so grouping or comparing graphs by unit never compares string contents
+UNIT_PERCENT = "%"
+UNIT_KILOBYTES = "kilobytes"
+UNIT_PACKETS = "packets per second"
+UNIT_BYTES = "bytes per second"
+UNIT_PROCESSES = "processes per second"
+UNIT_CSWITCHES = "cswitchs per second"
+UNIT_FREED_PAGES = "freed pages per second"
+UNIT_MEMORY_PAGES = "memory pages per second"
+
 BASE_GRAPHS = {
     "%user": {
         "cat": "Utilization",
         "label": "User Utilization (%)",
-        "unit": "%",
+        "unit": UNIT_PERCENT,
         "regexp": NUMBER_WITH_DEC_RE,
         "desc": """Percentage of CPU utilization that occurred while
                   executing at the user level (application). Note that this
@@ -65,7 +85,7 @@ BASE_GRAPHS = {
         "cat": "Utilization",
         "regexp": NUMBER_WITH_DEC_RE,
         "label": "User Utilization (novirt %)",
-        "unit": "%",
+        "unit": UNIT_PERCENT,
         "desc": """Percentage of CPU utilization that occurred while
                   executing at the user level (application). Note that this
                   field does NOT include time spent running virtual
@@ -75,7 +95,7 @@ BASE_GRAPHS = {
     "%system": {
         "cat": "Utilization",
         "regexp": NUMBER_WITH_DEC_RE,
-        "unit": "%",
+        "unit": UNIT_PERCENT,
         "desc": """Percentage of CPU utilization that occurred while
                   executing at the system level (kernel). Note that this field
                   includes time spent servicing hardware and software
@@ -86,7 +106,7 @@ BASE_GRAPHS = {
     "%sys": {
         "cat": "Utilization",
         "regexp": NUMBER_WITH_DEC_RE,
-        "unit": "%",
+        "unit": UNIT_PERCENT,
         "desc": """Percentage of CPU utilization that occurred while
                   executing at the system level (kernel). Note that this field
                   does NOT include time spent servicing hardware or software
@@ -96,7 +116,7 @@ BASE_GRAPHS = {
     "%iowait": {
         "cat": "Utilization",
         "regexp": NUMBER_WITH_DEC_RE,
-        "unit": "%",
+        "unit": UNIT_PERCENT,
         "desc": """Percentage of time that the CPU or CPUs were idle
                   during which the system had an outstanding disk I/O
                   request""",
@@ -105,7 +125,7 @@ BASE_GRAPHS = {
     "%irq": {
         "cat": "Utilization",
         "regexp": NUMBER_WITH_DEC_RE,
-        "unit": "%",
+        "unit": UNIT_PERCENT,
         "desc": """Percentage of time spent by the CPU or CPUs to
                   service hardware interrupts""",
         "detail": "%irq [/proc/stat(6)]",
@@ -113,7 +133,7 @@ BASE_GRAPHS = {
     "%soft": {
         "cat": "Utilization",
         "regexp": NUMBER_WITH_DEC_RE,
-        "unit": "%",
+        "unit": UNIT_PERCENT,
         "desc": """Percentage of time spent by the CPU or CPUs to
                   service software interrupts""",
         "detail": "%softirq [/proc/stat(7)]",
@@ -121,7 +141,7 @@ BASE_GRAPHS = {
     "%nice": {
         "cat": "Utilization",
         "regexp": NUMBER_WITH_DEC_RE,
-        "unit": "%",
+        "unit": UNIT_PERCENT,
         "desc": """Percentage of CPU utilization that occurred while
                   executing at the user level with nice priority""",
         "detail": "%nice [/proc/stat(2)]",
@@ -129,7 +149,7 @@ BASE_GRAPHS = {
     "%gnice": {
         "cat": "Utilization",
         "regexp": NUMBER_WITH_DEC_RE,
-        "unit": "%",
+        "unit": UNIT_PERCENT,
         "desc": """Percentage of time spent by the CPU or CPUs to run
                   a niced guest""",
         "detail": "%gnice [/proc/stat(10)]",
@@ -137,7 +157,7 @@ BASE_GRAPHS = {
     "%idle": {
         "cat": "Utilization",
         "regexp": NUMBER_WITH_DEC_RE,
-        "unit": "%",
+        "unit": UNIT_PERCENT,
         "desc": """Percentage of time that the CPU or CPUs were idle
                   and the system did not have an outstanding disk I/O
                   request""",
@@ -146,7 +166,7 @@ BASE_GRAPHS = {
     "%steal": {
         "cat": "Utilization",
         "regexp": NUMBER_WITH_DEC_RE,
-        "unit": "%",
+        "unit": UNIT_PERCENT,
         "desc": """Percentage of time that the CPU or CPUs were idle
                   and the system did not have an outstanding disk I/O
                   request""",
@@ -154,44 +174,12 @@ BASE_GRAPHS = {
     },
     "%guest": {
         "cat": "Utilization",
-        "unit": "%",
+        "unit": UNIT_PERCENT,
         "regexp": NUMBER_WITH_DEC_RE,
         "desc": """Percentage of time spent by the CPU or CPUs to run
                   a virtual processor""",
         "detail": "%guest [/proc/stat(9)]",
     },
-    "%scpu-10": {
-        "cat": "Utilization",
-        "unit": "%",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """Percentage of the time that at least some runnable tasks
-                  were delayed because the CPU was unavailable to them, over
-                  the last 10 second window.""",
-    },
-    "%scpu-60": {
-        "cat": "Utilization",
-        "unit": "%",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """Percentage of the time that at least some runnable tasks
-                  were delayed because the CPU was unavailable to them, over
-                  the last 60 second window.""",
-    },
-    "%scpu-300": {
-        "cat": "Utilization",
-        "unit": "%",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """Percentage of the time that at least some runnable tasks
-                  were delayed because the CPU was unavailable to them, over
-                  the last 300 second window.""",
-    },
-    "%scpu": {
-        "cat": "Utilization",
-        "unit": "%",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """Percentage of the time that at least some runnable tasks
-                  were delayed because the CPU was unavailable to them, over
-                  the last time interval.""",
-    },
     "runq-sz": {
         "cat": "Load",
         "regexp": INTEGER_RE,
@@ -246,62 +234,62 @@ BASE_GRAPHS = {
     },
     "proc/s": {
         "cat": "Load",
-        "unit": "processes per second",
+        "unit": UNIT_PROCESSES,
         "regexp": NUMBER_WITH_DEC_RE,
         "desc": """Total number of tasks created per second""",
         "detail": "processes [/proc/stat:processes]",
     },
     "cswch/s": {
         "cat": "Load",
-        "unit": "cswitchs per second",
+        "unit": UNIT_CSWITCHES,
         "regexp": NUMBER_WITH_DEC_RE,
         "desc": """Total number of context switches per second""",
         "detail": "ctxt [/proc/stat:ctxt]",
     },
     "kbmemfree": {
         "cat": "Memory",
-        "unit": "kilobytes",
+        "unit": UNIT_KILOBYTES,
         "regexp": INTEGER_RE,
         "desc": """Amount of free memory available in kilobytes""",
     },
     "kbmemused": {
         "cat": "Memory",
         "regexp": INTEGER_RE,
-        "unit": "kilobytes",
+        "unit": UNIT_KILOBYTES,
         "desc": """Amount of used memory in kilobytes. This does not
                   take into account memory used by the kernel itself""",
     },
     "%memused": {
         "cat": "Memory",
         "regexp": NUMBER_WITH_DEC_RE,
-        "unit": "%",
+        "unit": UNIT_PERCENT,
         "desc": """Percentage of used memory""",
     },
     "kbbuffers": {
         "cat": "Memory",
         "regexp": INTEGER_RE,
-        "unit": "kilobytes",
+        "unit": UNIT_KILOBYTES,
         "desc": """Amount of memory used as buffers by the kernel in
                   kilobytes""",
     },
     "kbcached": {
         "cat": "Memory",
         "regexp": INTEGER_RE,
-        "unit": "kilobytes",
+        "unit": UNIT_KILOBYTES,
         "desc": """Amount of memory used to cache data by the kernel
                   in kilobytes""",
     },
     "kbcommit": {
         "cat": "Memory",
         "regexp": INTEGER_RE,
-        "unit": "kilobytes",
+        "unit": UNIT_KILOBYTES,
         "desc": """Amount of memory in kilobytes needed for current
                   workload.  This is an estimate of how much RAM/swap is needed
                   to guarantee that there never is out of memory""",
     },
     "%commit": {
         "cat": "Memory",
-        "unit": "%",
+        "unit": UNIT_PERCENT,
         "regexp": NUMBER_WITH_DEC_RE,
         "desc": """Percentage of memory needed for current workload in
                   relation to the total amount of memory (RAM+swap). This
@@ -311,14 +299,14 @@ BASE_GRAPHS = {
     "kbactive": {
         "cat": "Memory",
         "regexp": INTEGER_RE,
-        "unit": "kilobytes",
+        "unit": UNIT_KILOBYTES,
         "desc": """Amount of active memory in kilobytes (memory that
                   has been used more recently and usually not reclaimed unless
                   absolutely necessary)""",
     },
     "kbinact": {
         "cat": "Memory",
-        "unit": "kilobytes",
+        "unit": UNIT_KILOBYTES,
         "regexp": INTEGER_RE,
         "desc": """Amount of inactive memory in kilobytes (memory
                   which has been less recently used. It is more eligible to be
@@ -326,55 +314,55 @@ BASE_GRAPHS = {
     },
     "kbdirty": {
         "cat": "Memory",
-        "unit": "kilobytes",
+        "unit": UNIT_KILOBYTES,
         "regexp": INTEGER_RE,
         "desc": """Amount of memory in kilobytes waiting to get
                   written back to the disk.""",
     },
     "kbanonpg": {
         "cat": "Memory",
-        "unit": "kilobytes",
+        "unit": UNIT_KILOBYTES,
         "regexp": INTEGER_RE,
         "desc": """Amount of non-file backed pages in
                    kilobytes mapped into userspace page tables.""",
     },
     "kbslab": {
         "cat": "Memory",
-        "unit": "kilobytes",
+        "unit": UNIT_KILOBYTES,
         "regexp": INTEGER_RE,
         "desc": """Amount of memory in kilobytes
                  used by the kernel for internal objects.""",
     },
     "kbavail": {
         "cat": "Memory",
-        "unit": "kilobytes",
+        "unit": UNIT_KILOBYTES,
         "regexp": INTEGER_RE,
         "desc": """Estimate of how much memory in kilobytes is available
                  for starting new applications, without swapping.""",
     },
     "kbkstack": {
         "cat": "Memory",
-        "unit": "kilobytes",
+        "unit": UNIT_KILOBYTES,
         "regexp": INTEGER_RE,
         "desc": """Amount of kstack memory
                    used for kernel stack space.""",
     },
     "kbpgtbl": {
         "cat": "Memory",
-        "unit": "kilobytes",
+        "unit": UNIT_KILOBYTES,
         "regexp": INTEGER_RE,
         "desc": """Amount of memory in kilobytes dedicated
                   to the lowest level of page tables.""",
     },
     "kbvmused": {
         "cat": "Memory",
-        "unit": "kilobytes",
+        "unit": UNIT_KILOBYTES,
         "regexp": INTEGER_RE,
         "desc": """KB of kernel vm space.""",
     },
     "kbhugfree": {
         "cat": "Memory",
-        "unit": "kilobytes",
+        "unit": UNIT_KILOBYTES,
         "regexp": INTEGER_RE,
         "desc": """Amount of hugepages memory in kilobytes that is not
                   yet allocated""",
@@ -382,33 +370,33 @@ BASE_GRAPHS = {
     "kbhugused": {
         "cat": "Memory",
         "regexp": INTEGER_RE,
-        "unit": "kilobytes",
+        "unit": UNIT_KILOBYTES,
         "desc": """Amount of hugepages memory in kilobytes that has
                   been allocated""",
     },
     "kbhugrsvd": {
         "cat": "Memory",
-        "unit": "kilobytes",
+        "unit": UNIT_KILOBYTES,
         "regexp": INTEGER_RE,
         "desc": """Amount of reserved hugepages memory in kilobytes.""",
     },
     "kbhugsurp": {
         "cat": "Memory",
-        "unit": "kilobytes",
+        "unit": UNIT_KILOBYTES,
         "regexp": INTEGER_RE,
         "desc": """Amount of surplus hugepages memory in kilobytes.""",
     },
     "%hugused": {
         "cat": "Memory",
         "regexp": NUMBER_WITH_DEC_RE,
-        "unit": "%",
+        "unit": UNIT_PERCENT,
         "desc": """Percentage of total hugepages memory that has been
                   allocated""",
     },
     "frmpg/s": {
         "cat": "Memory",
         "regexp": NUMBER_WITH_DEC_RE,
-        "unit": "freed pages per second",
+        "unit": UNIT_FREED_PAGES,
         "desc": """Number of memory pages freed by the system per
                   second. A negative value represents a number of pages
                   allocated by the system.  Note that a page has a size of 4 kB
@@ -417,7 +405,7 @@ BASE_GRAPHS = {
     "bufpg/s": {
         "cat": "Memory",
         "regexp": NUMBER_WITH_DEC_RE,
-        "unit": "memory pages per second",
+        "unit": UNIT_MEMORY_PAGES,
         "desc": """Number of additional memory pages used as buffers
                   by the system per second. A negative value means fewer pages
                   used as buffers by the system""",
@@ -429,70 +417,6 @@ BASE_GRAPHS = {
                   system per second. A negative value means fewer pages in the
                   cache""",
     },
-    "%smem-10": {
-        "cat": "Memory",
-        "unit": "%",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """Percentage of the time during which at least some tasks
-                  were waiting for memory resources, over the last 10 second
-                  window.""",
-    },
-    "%smem-60": {
-        "cat": "Memory",
-        "unit": "%",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """Percentage of the time during which at least some tasks
-                  were waiting for memory resources, over the last 60 second
-                  window.""",
-    },
-    "%smem-300": {
-        "cat": "Memory",
-        "unit": "%",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """Percentage of the time during which at least some tasks
-                  were waiting for memory resources, over the last 300 second
-                  window.""",
-    },
-    "%smem": {
-        "cat": "Memory",
-        "unit": "%",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """Percentage of the time during which at least some tasks
-                  were waiting for memory resources, over the last time
-                  interval.""",
-    },
-    "%fmem-10": {
-        "cat": "Memory",
-        "unit": "%",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """Percentage of the time during which all non-idle tasks
-                  were stalled waiting for memory resources, over the last
-                  10 second window.""",
-    },
-    "%fmem-60": {
-        "cat": "Memory",
-        "unit": "%",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """Percentage of the time during which all non-idle tasks
-                  were stalled waiting for memory resources, over the last
-                  60 second window.""",
-    },
-    "%fmem-300": {
-        "cat": "Memory",
-        "unit": "%",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """Percentage of the time during which all non-idle tasks
-                  were stalled waiting for memory resources, over the last
-                  300 second window.""",
-    },
-    "%fmem": {
-        "cat": "Memory",
-        "unit": "%",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """Percentage of the time during which all non-idle tasks
-                  were stalled waiting for memory resources, over the last
-                  time interval.""",
-    },
     "pswpin/s": {
         "cat": "Swap",
         "regexp": NUMBER_WITH_DEC_RE,
@@ -647,69 +571,41 @@ BASE_GRAPHS = {
                   device). Device saturation occurs when this value is close
                   to 100%""",
     },
-    "%sio-10": {
-        "cat": "I/O",
-        "unit": "%",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """Percentage of the time that at least some tasks lost waiting
-                  for I/O, over the last 10 second window.""",
-    },
-    "%sio-60": {
-        "cat": "I/O",
-        "unit": "%",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """Percentage of the time that at least some tasks lost waiting
-                  for I/O, over the last 30 second window.""",
+    "maxpower": {
+        "cat": "Power",
+        "regexp": INTEGER_RE,
+        "desc": """Maximum power consumption of the device expressed in mA.""",
     },
-    "%sio-300": {
-        "cat": "I/O",
-        "unit": "%",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """Percentage of the time that at least some tasks lost waiting
-                  for I/O, over the last 600 second window.""",
+    "MHz": {
+        "cat": "Power",
+        "regexp": INTEGER_RE,
+        "desc": """Instantaneous CPU clock frequency in MHz.""",
     },
-    "%sio": {
-        "cat": "I/O",
-        "unit": "%",
+    "FAN": {"cat": "Power", "regexp": INTEGER_RE, "desc": """Fan number."""},
+    "%temp": {
+        "cat": "Power",
+        "unit": UNIT_PERCENT,
         "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """Percentage of the time that at least some tasks lost waiting
-                  for I/O, over the last time interval.""",
+        "desc": """Current temperature relative to its upper limit
+                  (temp_max).""",
     },
-    "%fio-10": {
-        "cat": "I/O",
-        "unit": "%",
+    "degC": {
+        "cat": "Power",
         "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """Percentage of the time during which all non-idle tasks were
-                  stalled waiting for I/O, over the last 10 second window.""",
+        "desc": """Current device temperature expressed in degrees
+                  Celsius.""",
     },
-    "%fio-60": {
-        "cat": "I/O",
-        "unit": "%",
+    "drpm": {
+        "cat": "Power",
         "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """Percentage of the time during which all non-idle tasks were
-                  stalled waiting for I/O, over the last 60 second window.""",
+        "desc": """Difference between the current fan speed (rpm) and its
+                  low limit (fan_min).""",
     },
-    "%fio-300": {
-        "cat": "I/O",
-        "unit": "%",
+    "rpm": {
+        "cat": "Power",
         "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """Percentage of the time during which all non-idle tasks were
-                  stalled waiting for I/O, over the last 300 second window.""",
+        "desc": """Fan speed expressed in revolutions per minute.""",
     },
-    "%fio": {
-        "cat": "I/O",
-        "unit": "%",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """Percentage of the time during which all non-idle tasks were
-                  stalled waiting for I/O, over the last time interval.""",
-    },
-    "maxpower": {"cat": "Power", "regexp": INTEGER_RE, "desc": """Maxpower"""},
-    "MHz": {"cat": "Power", "regexp": INTEGER_RE, "desc": """MegaHertz"""},
-    "FAN": {"cat": "Power", "regexp": INTEGER_RE, "desc": """FAN"""},
-    "%temp": {"cat": "Power", "regexp": NUMBER_WITH_DEC_RE, "desc": """FAN"""},
-    "degC": {"cat": "Power", "regexp": NUMBER_WITH_DEC_RE, "desc": """Degrees"""},
-    "drpm": {"cat": "Power", "regexp": NUMBER_WITH_DEC_RE, "desc": """DRPM"""},
-    "rpm": {"cat": "Power", "regexp": NUMBER_WITH_DEC_RE, "desc": """RPM"""},
     "pgpgin/s": {
         "cat": "Paging",
         "regexp": NUMBER_WITH_DEC_RE,
@@ -1032,60 +928,60 @@ BASE_GRAPHS = {
     },
     "rxpck/s": {
         "cat": "Network",
-        "unit": "packets per second",
+        "unit": UNIT_PACKETS,
         "regexp": NUMBER_WITH_DEC_RE,
         "desc": """Total number of packets received per second""",
     },
     "txpck/s": {
         "cat": "Network",
-        "unit": "packets per second",
+        "unit": UNIT_PACKETS,
         "regexp": NUMBER_WITH_DEC_RE,
         "desc": """Total number of packets transmitted per
                   second""",
     },
     "rxbyt/s": {
         "cat": "Network",
-        "unit": "bytes per second",
+        "unit": UNIT_BYTES,
         "regexp": NUMBER_WITH_DEC_RE,
         "desc": """Total number of bytes received per second""",
     },
     "txbyt/s": {
         "cat": "Network",
-        "unit": "bytes per second",
+        "unit": UNIT_BYTES,
         "regexp": NUMBER_WITH_DEC_RE,
         "desc": """Total number of bytes transmitted per second""",
     },
     "rxcmp/s": {
         "cat": "Network",
         "regexp": NUMBER_WITH_DEC_RE,
-        "unit": "packets per second",
+        "unit": UNIT_PACKETS,
         "desc": """Number of compressed packets received per second
                   (for cslip etc.)""",
     },
     "txcmp/s": {
         "cat": "Network",
-        "unit": "packets per second",
+        "unit": UNIT_PACKETS,
         "regexp": NUMBER_WITH_DEC_RE,
         "desc": """Number of compressed packets transmitted per
                   second""",
     },
     "rxmcst/s": {
         "cat": "Network",
-        "unit": "packets per second",
+        "unit": UNIT_PACKETS,
         "regexp": NUMBER_WITH_DEC_RE,
         "desc": """Number of multicast packets received per
                   second""",
     },
     "%ifutil": {
         "cat": "Network",
-        "unit": "packets per second",
+        "unit": UNIT_PACKETS,
         "regexp": NUMBER_WITH_DEC_RE,
         "desc": """utilization percentage of
                  the network interface.""",
     },
     "rxerr/s": {
         "cat": "Network",
-        "unit": "packets per second",
+        "unit": UNIT_PACKETS,
         "regexp": NUMBER_WITH_DEC_RE,
         "desc": """Total number of bad packets received per
                   second""",
@@ -1104,14 +1000,14 @@ BASE_GRAPHS = {
     },
     "rxdrop/s": {
         "cat": "Network",
-        "unit": "packets per second",
+        "unit": UNIT_PACKETS,
         "regexp": NUMBER_WITH_DEC_RE,
         "desc": """Number of received packets dropped per second
                   because of a lack of space in linux buffers""",
     },
     "txdrop/s": {
         "cat": "Network",
-        "unit": "packets per second",
+        "unit": UNIT_PACKETS,
         "regexp": NUMBER_WITH_DEC_RE,
         "desc": """Number of transmitted packets dropped per second
                   because of a lack of space in linux buffers""",
@@ -1291,78 +1187,6 @@ BASE_GRAPHS = {
                   attempted to send per second [icmpOutMsgs]. Note that this
                   counter includes all those counted by oerr/s""",
     },
-    "iech/s": {
-        "cat": "Network",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """The number of ICMP Echo (request) messages received
-                  per second [icmpInEchos]""",
-    },
-    "iechr/s": {
-        "cat": "Network",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """The number of ICMP Echo Reply messages received per
-                  second [icmpInEchoReps]""",
-    },
-    "oech/s": {
-        "cat": "Network",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """The number of ICMP Echo (request) messages sent per
-                  second [icmpOutEchos]""",
-    },
-    "oechr/s": {
-        "cat": "Network",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """The number of ICMP Echo Reply messages sent per
-                  second [icmpOutEchoReps]""",
-    },
-    "itm/s": {
-        "cat": "Network",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """The number of ICMP Timestamp (request) messages
-                  received per second [icmpInTimestamps]""",
-    },
-    "itmr/s": {
-        "cat": "Network",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """The number of ICMP Timestamp Reply messages
-                  received per second [icmpInTimestampReps]""",
-    },
-    "otm/s": {
-        "cat": "Network",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """The number of ICMP Timestamp (request) messages
-                  sent per second [icmpOutTimestamps]""",
-    },
-    "otmr/s": {
-        "cat": "Network",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """The number of ICMP Timestamp Reply messages sent
-                  per second [icmpOutTimestampReps]""",
-    },
-    "iadrmk/s": {
-        "cat": "Network",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """The number of ICMP Address Mask Request messages
-                  received per second [icmpInAddrMasks]""",
-    },
-    "iadrmkr/s": {
-        "cat": "Network",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """The number of ICMP Address Mask Reply messages
-                  received per second [icmpInAddrMaskReps]""",
-    },
-    "oadrmk/s": {
-        "cat": "Network",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """The number of ICMP Address Mask Request messages
-                  sent per second [icmpOutAddrMasks]""",
-    },
-    "oadrmkr/s": {
-        "cat": "Network",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """The number of ICMP Address Mask Reply messages sent
-                  per second [icmpOutAddrMaskReps]""",
-    },
     "ierr/s": {
         "cat": "Network",
         "regexp": NUMBER_WITH_DEC_RE,
@@ -1377,66 +1201,6 @@ BASE_GRAPHS = {
                   entity did not send due to problems discovered within ICMP
                   such as a lack of buffers [icmpOutErrors]""",
     },
-    "idstunr/s": {
-        "cat": "Network",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """The number of ICMP Destination Unreachable messages
-                  received per second [icmpInDestUnreachs]""",
-    },
-    "odstunr/s": {
-        "cat": "Network",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """The number of ICMP Destination Unreachable messages
-                  sent per second [icmpOutDestUnreachs]""",
-    },
-    "itmex/s": {
-        "cat": "Network",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """The number of ICMP Time Exceeded messages received
-                  per second [icmpInTimeExcds]""",
-    },
-    "otmex/s": {
-        "cat": "Network",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """The number of ICMP Time Exceeded messages sent per
-                  second [icmpOutTimeExcds]""",
-    },
-    "iparmpb/s": {
-        "cat": "Network",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """The number of ICMP Parameter Problem messages
-                  received per second [icmpInParmProbs]""",
-    },
-    "oparmpb/s": {
-        "cat": "Network",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """The number of ICMP Parameter Problem messages sent
-                  per second [icmpOutParmProbs]""",
-    },
-    "isrcq/s": {
-        "cat": "Network",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """The number of ICMP Source Quench messages received
-                  per second [icmpInSrcQuenchs]""",
-    },
-    "osrcq/s": {
-        "cat": "Network",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """The number of ICMP Source Quench messages sent per
-                  second [icmpOutSrcQuenchs]""",
-    },
-    "iredir/s": {
-        "cat": "Network",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """The number of ICMP Redirect messages received per
-                  second [icmpInRedirects]""",
-    },
-    "oredir/s": {
-        "cat": "Network",
-        "regexp": NUMBER_WITH_DEC_RE,
-        "desc": """The number of ICMP Redirect messages sent per
-                  second [icmpOutRedirects]""",
-    },
     "blg_len": {
         "cat": "Network",
         "regexp": INTEGER_RE,
@@ -2001,79 +1765,258 @@ BASE_GRAPHS = {
     },
 }
 
+# The pressure-stall columns come in families: one column per averaging
+# window (10, 60 and 300 seconds) and one over the sampling interval
+_PRESSURE_STALL = {
+    "%scpu": (
+        "Utilization",
+        "Percentage of the time that at least some runnable tasks were "
+        "delayed because the CPU was unavailable to them",
+    ),
+    "%smem": (
+        "Memory",
+        "Percentage of the time during which at least some tasks were "
+        "waiting for memory resources",
+    ),
+    "%fmem": (
+        "Memory",
+        "Percentage of the time during which all non-idle tasks were "
+        "stalled waiting for memory resources",
+    ),
+    "%sio": (
+        "I/O",
+        "Percentage of the time that at least some tasks lost waiting for I/O",
+    ),
+    "%fio": (
+        "I/O",
+        "Percentage of the time during which all non-idle tasks were "
+        "stalled waiting for I/O",
+    ),
+}
+
+
+def _pressure_stall_graphs():
+    """Return the BASE_GRAPHS entries of the _PRESSURE_STALL families"""
+    graphs = {}
+    for name, (cat, desc) in _PRESSURE_STALL.items():
+        for window in (10, 60, 300):
+            graphs["%s-%d" % (name, window)] = {
+                "cat": cat,
+                "unit": UNIT_PERCENT,
+                "regexp": NUMBER_WITH_DEC_RE,
+                "desc": "%s, over the last %d second window." % (desc, window),
+            }
+        graphs[name] = {
+            "cat": cat,
+            "unit": UNIT_PERCENT,
+            "regexp": NUMBER_WITH_DEC_RE,
+            "desc": "%s, over the last time interval." % desc,
+        }
+    return graphs
+
+
+BASE_GRAPHS.update(_pressure_stall_graphs())
+
+# ICMP message counters: for every message type there is a column for the
+# received (i<name>/s) and one for the sent (o<name>/s) messages. Each entry
+# is (name, message type, suffix of the icmpIn/icmpOut SNMP counters)
+_ICMP_MESSAGES = (
+    ("ech", "Echo (request)", "Echos"),
+    ("echr", "Echo Reply", "EchoReps"),
+    ("tm", "Timestamp (request)", "Timestamps"),
+    ("tmr", "Timestamp Reply", "TimestampReps"),
+    ("adrmk", "Address Mask Request", "AddrMasks"),
+    ("adrmkr", "Address Mask Reply", "AddrMaskReps"),
+    ("dstunr", "Destination Unreachable", "DestUnreachs"),
+    ("tmex", "Time Exceeded", "TimeExcds"),
+    ("parmpb", "Parameter Problem", "ParmProbs"),
+    ("srcq", "Source Quench", "SrcQuenchs"),
+    ("redir", "Redirect", "Redirects"),
+)
+
+
+def _icmp_graphs():
+    """Return the BASE_GRAPHS entries of the _ICMP_MESSAGES counters"""
+    graphs = {}
+    for name, msg, counter in _ICMP_MESSAGES:
+        for prefix, direction, mib in (("i", "received", "In"), ("o", "sent", "Out")):
+            graphs["%s%s/s" % (prefix, name)] = {
+                "cat": "Network",
+                "regexp": NUMBER_WITH_DEC_RE,
+                "desc": "The number of ICMP %s messages %s per second [icmp%s%s]"
+                % (msg, direction, mib, counter),
+            }
+    return graphs
+
+
+BASE_GRAPHS.update(_icmp_graphs())
+
+
+def _finish_graphs(graphs):
+    """Return the BASE_GRAPHS table with its strings interned and the
+    optional keys of its entries filled in"""
+    ret = {}
+    for name, graph in graphs.items():
+        # The category and unit values get compared against the literals
+        # used by sar_stats and sar_grapher and end up as dict keys there
+        graph["cat"] = sys.intern(graph["cat"])
+        if "unit" in graph:
+            graph["unit"] = sys.intern(graph["unit"])
+        # Fill in the optional keys, so that reading them needs no
+        # membership test
+        graph.setdefault("unit", None)
+        graph.setdefault("label", None)
+        graph.setdefault("detail", None)
+        # Column headers read from the sar files are interned by the parser,
+        # so interning the keys too lets every lookup succeed on the
+        # identity check instead of comparing the strings
+        ret[sys.intern(name)] = graph
+    return ret
+
+
+def _category_index(graphs):
+    """Return the names of the graphs grouped by category"""
+    index = {}
+    for name, graph in graphs.items():
+        index.setdefault(graph["cat"], set()).add(name)
+    return {cat: frozenset(names) for cat, names in index.items()}
+
+
+BASE_GRAPHS = _finish_graphs(BASE_GRAPHS)
+
+# Names of the BASE_GRAPHS entries grouped by category, so that callers
+# wanting all the graphs of one category need not scan the whole table
+CATEGORY_INDEX = _category_index(BASE_GRAPHS)
+
+# The table is complete: make it and its entries read-only, as the memoized
+# helpers below would keep serving stale answers if it were modified
+# afterwards
+BASE_GRAPHS = types.MappingProxyType(
+    {name: types.MappingProxyType(graph) for name, graph in BASE_GRAPHS.items()}
+)
+
+# Interrupt graphs have no BASE_GRAPHS entry and are recognised by name:
+# "i000/s" on its own (match()) or anywhere in "INTR#0#i000/s" (search(),
+# which unlike a leading ".*" does not backtrack over the whole name)
+_INTERRUPT_RE = re.compile(r"i[0-9]*/s")
+
+
+# Descriptions are cleaned up on first use: only the pdf report needs them,
+# so parsing, --list and --csv never pay for it
+@functools.lru_cache(maxsize=None)
+def _description(name):
+    """Given a BASE_GRAPHS name return its description on a single line"""
+    # split() and join() do in C what a [\n ]+ substitution does in the
+    # regexp engine, and drop the stray leading/trailing blanks too
+    return " ".join(BASE_GRAPHS[name]["desc"].split())
+
+
+# Columns whose regexp is not the one of their BASE_GRAPHS entry (if any)
+_COLUMN_REGEXPS = {
+    "IFACE": INTERFACE_NAME_RE,
+    "DEV": DEVICE_NAME_RE,
+    "CPU": CPU_RE,
+    "INTR": INT_RE,
+    "iNNN/s": INTERRUPTS_RE,
+    "BUS": INTEGER_RE,
+    "FAN": INTEGER_RE,
+    "DEVICE": INTERFACE_NAME_RE,
+    "TEMP": INTEGER_RE,
+    "TTY": INTEGER_RE,
+    "idvendor": HEX_RE,
+    "idprod": HEX_RE,
+    "manufact": USB_NAME_RE,
+    "product": USB_NAME_RE,
+    "MHz": NUMBER_WITH_DEC_RE,
+    "FILESYSTEM": FS_NAME_RE,
+}
+
 
+@functools.lru_cache(maxsize=None)
 def get_regexp(name):
     """Given a graph name return the correct regexp to identify the data in a
     sar file"""
-    k = {
-        "IFACE": INTERFACE_NAME_RE,
-        "DEV": DEVICE_NAME_RE,
-        "CPU": CPU_RE,
-        "INTR": INT_RE,
-        "iNNN/s": INTERRUPTS_RE,
-        "BUS": INTEGER_RE,
-        "FAN": INTEGER_RE,
-        "DEVICE": INTERFACE_NAME_RE,
-        "TEMP": INTEGER_RE,
-        "TTY": INTEGER_RE,
-        "idvendor": HEX_RE,
-        "idprod": HEX_RE,
-        "manufact": USB_NAME_RE,
-        "product": USB_NAME_RE,
-        "MHz": NUMBER_WITH_DEC_RE,
-        "FILESYSTEM": FS_NAME_RE,
-    }
-
-    if name in k:
-        return k[name]
+    if name in _COLUMN_REGEXPS:
+        return _COLUMN_REGEXPS[name]
 
     if name in BASE_GRAPHS and "regexp" in BASE_GRAPHS[name]:
         return BASE_GRAPHS[name]["regexp"]
 
-    if re.match("i[0-9]*/s", name):
+    if _INTERRUPT_RE.match(name):
         return INTERRUPTS_RE
 
     raise Exception("regexp for %s could not be found" % name)
 
 
+@functools.lru_cache(maxsize=128)
+def data_line_regexp(headers):
+    """Given a tuple of column headers return the compiled regexp matching
+    the corresponding data lines. The same header line is repeated for every
+    table of a given type (and in every sar file of a report), so the
+    compiled regexp is cached. The regexp is not anchored: use fullmatch()"""
+    regexp = r"(" + TIMESTAMP_RE + r")"
+    for hdr in headers:
+        regexp += r"\s+(" + get_regexp(hdr) + r")"
+    regexp += r"\s*"
+    # sar output is plain ASCII: re.ASCII lets \d and \s skip the Unicode
+    # character tables
+    return re.compile(regexp, re.ASCII)
+
+
+def _simple_graph_info(name):
+    """graph_info() for a graph whose name is not in the "CPU#0#%idle"
+    form"""
+    # If the name does not exist in the BASE_GRAPHS dict we just
+    # use the name itself for title and label
+    graph = BASE_GRAPHS.get(name)
+    if graph is None:
+        return name, None, name
+
+    # If a graph has the 'label' attribute we use that for
+    # Title and label
+    s = graph["label"] or name
+    return s, graph["unit"], s
+
+
 def graph_info(names, sar_obj=None):
     """Given a list of graph names it returns a list of tuples of title,
     unit, labels. title is the title of the whole graph, unit represents
     the unit of the graph(s) if one exists and if it is the same among all
     graphs. labels are the names of the plotted dataseries as seen in
     the legend of the graph"""
-    cat = {}
-    key = {}
-    perf = {}
+    # Most graphs are a single simple series like "ldavg-1"
+    if len(names) == 1 and "#" not in names[0]:
+        return _simple_graph_info(names[0])
+
+    # Only whether all the names share the same category and perf key
+    # matters, so compare them with the first ones instead of collecting
+    # them
+    cat = perf_key = None
+    multi_cat = multi_perf = False
+    # This takes the CPU number (in case of a CPU#1#%idle series
+    labels = []
     for i in names:
-        try:
-            (c, k, p) = i.split("#")
+        parts = i.split("#")
         # It is not in the "CPU#0#%idle" form
-        except Exception:
-            # If the name does not exist in the BASE_GRAPHS dict we just
-            # use the name itself for title and label
-            if not names[0] in BASE_GRAPHS:
-                return names[0], None, names[0]
-
-            # If a graph has the 'label' attribute we use that for
-            # Title and label
-            s = names[0]
-            if "label" in BASE_GRAPHS[names[0]]:
-                s = BASE_GRAPHS[names[0]]["label"]
-
-            unit = None
-            if "unit" in BASE_GRAPHS[names[0]]:
-                unit = BASE_GRAPHS[names[0]]["unit"]
-
-            return s, unit, s
-        cat[c] = True
-        key[k] = True
-        perf[p] = True
+        if len(parts) != 3:
+            return _simple_graph_info(names[0])
+        if multi_cat:
+            # The outcome is an error unless a later name is not in the
+            # "CPU#0#%idle" form: only that is left to check
+            continue
+        if cat is None:
+            cat, perf_key = parts[0], parts[2]
+        elif parts[0] != cat:
+            multi_cat = True
+            continue
+        else:
+            multi_perf = multi_perf or parts[2] != perf_key
+        labels.append(parts[1])
 
     # We can raise an error here because in case of a custom graph with
     # different datasets the label is set by the user and this function is
     # never called
-    if len(cat.keys()) > 1:
+    if multi_cat:
         raise Exception(
             "Error. We do not contemplate graphing data from"
             " different categories: %s" % names
@@ -2082,13 +2025,12 @@ def graph_info(names, sar_obj=None):
     # ['CPU#0#%idle', 'CPU#1#%idle', 'CPU#3#%idle', ...]
     # title = '%idle'
     # labels = ['CPU0', 'CPU1', 'CPU2', ...]
-    if len(perf.keys()) == 1:
-        perf_key = list(perf.keys())[0]
+    if perf_key is not None and not multi_perf:
         title = "%s" % (perf_key)
         # It is an interrupt and sosreport exists and has interrupts dictionary
         # hence we print the device that generated it in the title
         if (
-            re.match("i[0-9]*/s", title) and
+            _INTERRUPT_RE.match(title) and
             sar_obj is not None and
             sar_obj.sosreport is not None and
             sar_obj.sosreport.interrupts is not None
@@ -2100,42 +2042,46 @@ def graph_info(names, sar_obj=None):
             # Just leave the original title in case of errors
             except Exception:
                 pass
-        # This takes the CPU number (in case of a CPU#1#%idle series
-        labels = ["".join(i.split("#")[1:2]) for i in names]
-        unit = None
-        if perf_key in BASE_GRAPHS and "unit" in BASE_GRAPHS[perf_key]:
-            unit = BASE_GRAPHS[perf_key]["unit"]
+        graph = BASE_GRAPHS.get(perf_key)
+        unit = graph["unit"] if graph is not None else None
         return title, unit, labels
 
     raise Exception("get_labels_title() error on %s" % names)
 
 
+# The categories never change after import: the ones of the graphs of the
+# indexed tables plus the ones of the BASE_GRAPHS entries
+_ALL_CATEGORIES = frozenset(
+    {"Load", "Files", "I/O", "TTY", "Network", "Power", "Intr"}
+).union(CATEGORY_INDEX)
+
+
 def list_all_categories():
-    categories = {"Load", "Files", "I/O", "TTY", "Network", "Power", "Intr"}
-    for i in BASE_GRAPHS.keys():
-        cat = BASE_GRAPHS[i]["cat"]
-        categories.update([cat])
-    return categories
+    return set(_ALL_CATEGORIES)
+
+
+# Category of the graphs of the tables that have an index column, keyed by
+# the part of their name before the first "#" (e.g. "CPU" in "CPU#0#%idle")
+_CATEGORY_PREFIXES = {
+    "CPU": "Load",
+    "FILESYSTEM": "Files",
+    "DEV": "I/O",
+    "TTY": "TTY",
+    "IFACE": "Network",
+    "TEMP": "Power",
+    "FAN": "Power",
+    "INTR": "Intr",
+}
 
 
+# Called by the parser for every column of every table, while the set of
+# distinct names in a report is small: memoize it
+@functools.lru_cache(maxsize=None)
 def get_category(name):
     """Given a graph name, return the corresponding Category"""
-    if name.startswith("CPU#"):
-        return "Load"
-    elif name.startswith("FILESYSTEM#"):
-        return "Files"
-    elif name.startswith("DEV#"):
-        return "I/O"
-    elif name.startswith("TTY"):
-        return "TTY"
-    elif name.startswith("IFACE"):
-        return "Network"
-    elif name.startswith("TEMP#"):
-        return "Power"
-    elif name.startswith("FAN#"):
-        return "Power"
-    elif name.startswith("INTR#"):
-        return "Intr"
+    cat = _CATEGORY_PREFIXES.get(name.partition("#")[0])
+    if cat is not None:
+        return cat
 
     if name in BASE_GRAPHS:
         return BASE_GRAPHS[name]["cat"]
@@ -2147,6 +2093,67 @@ def get_category(name):
     return "Interrupts"
 
 
+def get_categories(names):
+    """Given a list of graph names, return the list of their Categories"""
+    return [get_category(i) for i in names]
+
+
+def index_category(column):
+    """Given the index column of a table (e.g. "CPU"), return the Category
+    of all the graphs of that table (e.g. "CPU#0#%idle")"""
+    # Same fallback as get_category() for the names of unknown tables
+    return _CATEGORY_PREFIXES.get(column, "Interrupts")
+
+
+@functools.lru_cache(maxsize=None)
+def get_desc_single(name):
+    """Given a single graph name it returns a (name, description, detail)
+    tuple, or None if the graph is unknown. detail may be None"""
+    if name in BASE_GRAPHS:
+        return name, _description(name), BASE_GRAPHS[name]["detail"]
+
+    # Graphs like: IFACE#eth2#rxkB/s
+    parts = name.split("#")
+    if len(parts) > 2 and parts[2] in BASE_GRAPHS:
+        perf = parts[2]
+        return perf, _description(perf), BASE_GRAPHS[perf]["detail"]
+
+    if _INTERRUPT_RE.search(name):
+        return "int/s", "Interrupts per second", None
+    return None
+
+
+def get_desc_many(names):
+    """Given the list of graph names of a combined graph it returns a list
+    of (name, description, detail) tuples, one per distinct kind of
+    graph. detail may be None"""
+    ret = []
+    # Names of the entries already in ret: the datasets of a combined graph
+    # are not necessarily grouped by kind
+    seen = set()
+    for i in names:
+        # rpartition() only builds a 3-tuple, where split() would build a
+        # list we throw away
+        head, _, perf = i.rpartition("#")
+        if "#" not in head:
+            # It is a combination of simple graphs (like ldavg-{1,5,15})
+            perf = i
+        elif _INTERRUPT_RE.search(perf):
+            perf = "int/s"
+        if perf in seen:
+            continue
+        seen.add(perf)
+
+        if perf == "int/s":
+            ret.append((perf, "Interrupts per second", None))
+        elif perf == i:
+            ret.append((i, _description(i), None))
+        else:
+            ret.append((perf, _description(perf), BASE_GRAPHS[perf]["detail"]))
+
+    return ret
+
+
 def get_desc(names):
     """Given a list of graph names it returns a list of [(name, description,
     detail), ...] list of three-element tuples. description or detail may be
@@ -2154,55 +2161,13 @@ def get_desc(names):
     if not isinstance(names, list):
         raise Exception("get_desc mandates a list: %s" % names)
 
-    regex = re.compile("[\n ]+")
-    if len(names) == 1:
-        name = names[0]
-        if name in BASE_GRAPHS:
-            desc = BASE_GRAPHS[name]["desc"]
-            detail = None
-            if "detail" in BASE_GRAPHS[name]:
-                detail = BASE_GRAPHS[name]["detail"]
-            return [[name, regex.sub(" ", desc), detail]]
-
-        try:
-            # Graphs like: IFACE#eth2#rxkB/s
-            perf = name.split("#")[2]
-            desc = BASE_GRAPHS[perf]["desc"]
-            detail = None
-            if "detail" in BASE_GRAPHS[perf]:
-                detail = BASE_GRAPHS[perf]["detail"]
-            return [[perf, regex.sub(" ", desc), detail]]
-        except Exception:
-            pass
-        if re.match(".*i[0-9]*/s", name):
-            return [["int/s", "Interrupts per second", None]]
-    else:
-        ret = []
-        previous = None
-        for i in names:
-            try:
-                perf = i.split("#")[2]
-                if re.match(".*i[0-9]*/s", perf):
-                    if previous != "int/s":
-                        ret.append(["int/s", "Interrupts per second", None])
-                        previous = "int/s"
-                    continue
-
-                desc = BASE_GRAPHS[perf]["desc"]
-                detail = None
-                if "detail" in BASE_GRAPHS[perf]:
-                    detail = BASE_GRAPHS[perf]["detail"]
-                if previous != perf:
-                    ret.append([perf, regex.sub(" ", desc), detail])
-                    previous = perf
-            except Exception:
-                # It is a combination of simple graphs (like ldavg-{1,5,15})
-                desc = BASE_GRAPHS[i]["desc"]
-                ret.append([i, regex.sub(" ", desc), None])
-
-        return ret
+    if len(names) != 1:
+        return get_desc_many(names)
 
-    raise Exception("Unknown graph: %s" % names)
+    desc = get_desc_single(names[0])
+    if desc is None:
+        raise Exception("Unknown graph: %s" % names)
+    return [desc]
 
 
 # vim: autoindent tabstop=4 expandtab smarttab shiftwidth=4 softtabstop=4 tw=0
@@ -33,6 +33,7 @@ import dateutil
 import os
 import numpy
 import re
+import sys
 
 import sar_metadata
 from sos_report import SosReport
@@ -40,30 +41,79 @@ from sos_report import SosReport
 # regex of the sar column containing the time of the measurement
 TIMESTAMP_RE = re.compile(r"(\d{2}):(\d{2}):(\d{2})\s?(AM|PM)?")
 
+# Compile the regexps used by the parser once at import rather than on
+# every call
+_NATURAL_SORT_RE = re.compile("([0-9]+)")
+
+# First line of a SAR report
+_FIRST_LINE_RE = re.compile(
+    r"""(?x)
+    ^(\S+)\s+                 # Kernel name (uname -s)
+    (\S+)\s+                  # Kernel release (uname -r)
+    \((\S+)\)\s+              # Hostname
+    ((?:\d{4}-\d{2}-\d{2})|   # Date in YYYY-MM-DD format
+     (?:\d{2}/\d{2}/\d{2,4})) #      in MM/DD/(YY)YY format
+    .*$                       # Remainder, ignored
+    """
+)
+_MMDDYY_RE = re.compile(r"(\d{2})/(\d{2})/(\d{2,4})")
+
+# Line of column headers
+_COLUMN_HEADERS_RE = re.compile(
+    r"""(?x)
+    ^("""
+    + sar_metadata.TIMESTAMP_RE
+    + r""")\s+
+    (
+        # Time to be strict - we don't want to
+        # accidentally end up recognising lines of
+        # data as lines defining column structure
+        # Any field that has numbers inside of it needs
+        # to be explicitely ORed
+        (?:
+            (?:[a-zA-Z1360%/_-]+    # No numbers (except for IPv6 and the %scpu-{10,60,300})
+            |                       # and except...
+            i\d{3}/s
+            |
+            i2big6/s
+            |
+            ipck2b6/s
+            |
+            opck2b6/s
+            |
+            ldavg-\d+
+            )
+            \s*
+        )+
+    )       # Column headers, all matched as one group
+    \s*$
+    """
+)
+
 
 def natural_sort_key(s):
     """Natural sorting function. Given a string, it returns a list of the strings
     and numbers. For example: natural_sort_key("michele0123") will return:
     ['michele', 123, '']"""
 
-    _nsre = re.compile("([0-9]+)")
     return [
-        int(text) if text.isdigit() else text.lower() for text in re.split(_nsre, s)
+        int(text) if text.isdigit() else text.lower()
+        for text in _NATURAL_SORT_RE.split(s)
     ]
 
 
 def _empty_line(line):
     """Parse an empty line"""
 
-    pattern = re.compile(r"^\s*$")
-    return re.search(pattern, line)
+    # Plain string methods: these two run on every line, and a regexp
+    # would be several times slower for the same answer
+    return line.isspace() or not line
 
 
 def _average_line(line):
     """Parse a line starting with 'Average:'or 'Summary:'"""
 
-    pattern = re.compile(r"^Average|^Summary")
-    return re.search(pattern, line)
+    return line.startswith(("Average", "Summary"))
 
 
 def canonicalise_timestamp(date, ts):
@@ -72,7 +122,7 @@ def canonicalise_timestamp(date, ts):
     sar datetime date object as base and the time string column
     return a full datetime object"""
 
-    matches = re.search(TIMESTAMP_RE, ts)
+    matches = TIMESTAMP_RE.search(ts)
     if matches:
         (hours, minutes, seconds, meridiem) = matches.groups()
         hours = int(hours)
@@ -200,18 +250,7 @@ class SarParser(object):
     def _parse_first_line(self, line):
         """Parse the line as a first line of a SAR report"""
 
-        pattern = re.compile(
-            r"""(?x)
-            ^(\S+)\s+                 # Kernel name (uname -s)
-            (\S+)\s+                  # Kernel release (uname -r)
-            \((\S+)\)\s+              # Hostname
-            ((?:\d{4}-\d{2}-\d{2})|   # Date in YYYY-MM-DD format
-             (?:\d{2}/\d{2}/\d{2,4})) #      in MM/DD/(YY)YY format
-            .*$                       # Remainder, ignored
-            """
-        )
-
-        matches = re.search(pattern, line)
+        matches = _FIRST_LINE_RE.search(line)
         if matches:
             (self.kernel, self.version, self.hostname, tmpdate) = matches.groups()
         else:
@@ -220,8 +259,7 @@ class SarParser(object):
                 " first line".format(self._linecount, line)
             )
 
-        pattern = re.compile(r"(\d{2})/(\d{2})/(\d{2,4})")
-        matches = re.search(pattern, tmpdate)
+        matches = _MMDDYY_RE.search(tmpdate)
         if matches:
             (mm, dd, yyyy) = matches.groups()
             if len(yyyy) == 2:
@@ -232,40 +270,9 @@ class SarParser(object):
 
     def _column_headers(self, line):
         """Parse the line as a set of column headings"""
-        restr = (
-            r"""(?x)
-            ^("""
-            + sar_metadata.TIMESTAMP_RE
-            + """)\s+
-            (
-                # Time to be strict - we don't want to
-                # accidentally end up recognising lines of
-                # data as lines defining column structure
-                # Any field that has numbers inside of it needs
-                # to be explicitely ORed
-                (?:
-                    (?:[a-zA-Z1360%/_-]+    # No numbers (except for IPv6 and the %scpu-{10,60,300})
-                    |                       # and except...
-                    i\d{3}/s
-                    |
-                    i2big6/s
-                    |
-                    ipck2b6/s
-                    |
-                    opck2b6/s
-                    |
-                    ldavg-\d+
-                    )
-                    \s*
-                )+
-            )       # Column headers, all matched as one group
-            \s*$
-            """
-        )
-        pattern = re.compile(restr)
-        matches = re.search(pattern, line)
+        matches = _COLUMN_HEADERS_RE.search(line)
         if matches:
-            hdrs = [h for h in matches.group(2).split(" ") if h != ""]
+            hdrs = [sys.intern(h) for h in matches.group(2).split(" ") if h != ""]
             return matches.group(1), hdrs
         else:
             return None, None
@@ -275,37 +282,39 @@ class SarParser(object):
 
         self._parse_first_line(line)
 
-    def _column_type_regexp(self, hdr):
-        """Get the regular expression to match entries under a
-        particular header"""
-
-        return sar_metadata.get_regexp(hdr)
-
-    def _valid_column_header_name(self, hdr):
-        """Is hdr a valid column name?"""
-
-        return self._column_type_regexp(hdr) is not None
-
-    def _build_data_line_regexp(self, headers):
-        """
-        Given a list of headers, build up a regular expression to match
-        corresponding data lines.
-        """
-        regexp = r"^(" + sar_metadata.TIMESTAMP_RE + r")"
-        for hdr in headers:
-            hre = self._column_type_regexp(hdr)
-            if hre is None:
-                raise Exception(
-                    'Line {0}: column header "{1}"'
-                    "unknown".format(self._linecount, hdr)
-                )
-            regexp = regexp + r"\s+(" + str(hre) + r")"
-        regexp += r"\s*$"
-        return regexp
+    def _table_layout(self, headers):
+        """Work out, once per table, the position of the index column (None
+        if there is none), the names under which the columns are recorded
+        and their categories"""
+        column = 0
+        # The column used as index/key can be different
+        for i in headers:
+            if i in sar_metadata.INDEX_COLUMN:
+                # The category of "CPU#0#%idle" depends on the index column
+                # only. The list is indexed like headers, so it has an (unused)
+                # slot for the index column too
+                categories = [sar_metadata.index_category(i)] * len(headers)
+                return column, headers, categories
+            column += 1
 
-    def _record_data(self, headers, matches):
-        """Record a parsed line of data"""
-        timestamp = canonicalise_timestamp(self._date, matches.group(1))
+        names = []
+        previous = ""
+        for i in headers:
+            # HACK due to sysstat idiocy (retrans/s can appear in ETCP and
+            # NFS) Rename ETCP retrans/s to retrant/s
+            if i == "retrans/s" and previous == "estres/s":
+                i = "retrant/s"
+            names.append(i)
+            previous = i
+        return None, names, sar_metadata.get_categories(names)
+
+    def _record_data(self, layout, matches):
+        """Record a parsed line of data. layout is what _table_layout()
+        returned for the headers of the current table"""
+        # The whole row was matched by one regexp: fetch all of its fields
+        # at once. fields[0] is the timestamp, the columns follow
+        fields = matches.groups()
+        timestamp = canonicalise_timestamp(self._date, fields[0])
         # We skip recording values if the timestamp is not within the limits
         # defined by the user
         if self.starttime and timestamp < self.starttime:
@@ -318,7 +327,7 @@ class SarParser(object):
                 nextday = timestamp + datetime.timedelta(days=1)
                 self._olddate = self._date
                 self._date = (nextday.year, nextday.month, nextday.day)
-                timestamp = canonicalise_timestamp(self._date, matches.group(1))
+                timestamp = canonicalise_timestamp(self._date, fields[0])
             elif timestamp < self._prev_timestamp:
                 raise Exception(
                     "Time going backwards: {0} "
@@ -333,36 +342,24 @@ class SarParser(object):
         if timestamp not in self._data:
             self._data[timestamp] = {}
 
-        column = 0
-        # The column used as index/key can be different
-        for i in headers:
-            if i in sar_metadata.INDEX_COLUMN:
-                break
-            column += 1
+        (column, headers, categories) = layout
 
         # Simple case: data is "2D": all columns are of a simple data type
         # that has just one datum per timestamp
-        if column >= len(headers):
+        if column is None:
             counter = 0
-            previous = ""
-            for header in headers:
-                i = header
-                # HACK due to sysstat idiocy (retrans/s can appear in ETCP and
-                # NFS) Rename ETCP retrans/s to retrant/s
-                if i == "retrans/s" and previous == "estres/s":
-                    i = "retrant/s"
+            for i in headers:
                 if i in self._data[timestamp]:
                     # We do not bail out anymore on duplicate timestamps but
                     # simply report it to the user
                     self._duplicate_timestamps[self._linecount] = True
 
                 try:
-                    v = float(matches.group(counter + 2))
+                    v = float(fields[counter + 1])
                 except ValueError:
-                    v = matches.group(counter + 2)
+                    v = fields[counter + 1]
                 self._data[timestamp][i] = v
-                self._categories[i] = sar_metadata.get_category(i)
-                previous = i
+                self._categories[i] = categories[counter]
                 counter += 1
             return timestamp
 
@@ -370,7 +367,7 @@ class SarParser(object):
         # (CPU number, device name etc.) and there is one datum per index
         # column value per timestamp
         indexcol = headers[column]
-        indexval = matches.group(column + 2)
+        indexval = fields[column + 1]
         if indexval == "all" or indexval == "Summary":
             # This is derived information that is only included for some types
             # of data. Let's save ourselves the complication.
@@ -385,7 +382,9 @@ class SarParser(object):
                 counter += 1
                 continue
 
-            s = "{0}#{1}#{2}".format(indexcol, indexval, i)
+            # The same name is a key in the dict of every timestamp: intern it
+            # so that all of them share a single string
+            s = sys.intern("{0}#{1}#{2}".format(indexcol, indexval, i))
             if s in self._data[timestamp]:
                 # LOVELY: Filesystem can have multiple entries with the same
                 # FILESYSTEM and timestamp We used to raise an exception here
@@ -396,11 +395,11 @@ class SarParser(object):
                 self._duplicate_timestamps[self._linecount] = True
 
             try:
-                v = float(matches.group(counter + 2))
+                v = float(fields[counter + 1])
             except ValueError:
-                v = matches.group(counter + 2)
+                v = fields[counter + 1]
             self._data[timestamp][s] = v
-            self._categories[s] = sar_metadata.get_category(s)
+            self._categories[s] = categories[counter]
             counter += 1
 
         return timestamp
@@ -476,7 +475,7 @@ class SarParser(object):
                         continue
 
                     try:
-                        pattern = re.compile(self._build_data_line_regexp(headers))
+                        pattern = sar_metadata.data_line_regexp(tuple(headers))
                     except AssertionError:
                         raise Exception(
                             "Line {0}: exceeding python "
@@ -484,6 +483,9 @@ class SarParser(object):
                             'this line "{1}"'.format(self._linecount, line)
                         )
 
+                    # Bind the method once: it is called for every row
+                    match_line = pattern.fullmatch
+                    layout = self._table_layout(headers)
                     self._prev_timestamp = False
                     state = "table_row"
                     continue
@@ -497,7 +499,7 @@ class SarParser(object):
                         state = "table_end"
                         continue
 
-                    matches = re.search(pattern, line)
+                    matches = match_line(line)
                     if matches is None:
                         raise Exception(
                             "File: {0} - Line {1}: headers: '{2}'"
@@ -511,7 +513,7 @@ class SarParser(object):
                             )
                         )
 
-                    self._record_data(headers, matches)
+                    self._record_data(layout, matches)
                     continue
 
                 if state == "table_end":
@@ -194,19 +194,12 @@ class SarStats(object):
         """Order in which to present all graphs.
         Data is grouped loosely by type."""
         skiplist = skip_list or []
-        my_list = []
         sar_grapher = self.sar_grapher
         sar_parser = sar_grapher.sar_parser
-        # First we add all the simple graphs sorted by chosen category list
-        for i in cat:
-            for j in sorted(sar_parser.available_data_types(), key=natural_sort_key):
-                # We cannot graph a column with device names
-                if j.endswith("DEVICE"):
-                    continue
-                if metadata.get_category(j) == i:
-                    my_list.append([j])
+        # Sort the datasets once rather than once per category
+        datasets = sorted(sar_parser.available_data_types(), key=natural_sort_key)
 
-        # Here we add the combined graphs always per category
+        # First we collect the combined graphs always per category
         c = {}
         for i in metadata.INDEX_COLUMN:
             s = sar_parser.datanames_per_arg(i, False)
@@ -223,12 +216,9 @@ class SarStats(object):
         # and then combined graphs
         my_list = []
         for i in cat:
-            for j in sorted(sar_parser.available_data_types(), key=natural_sort_key):
-                if (
-                    j in metadata.BASE_GRAPHS
-                    and metadata.BASE_GRAPHS[j]["cat"] == i
-                    and j not in skiplist
-                ):
+            graphs = metadata.CATEGORY_INDEX.get(i, ())
+            for j in datasets:
+                if j in graphs and j not in skiplist:
                     entry = metadata.graph_info([j], sar_obj=sar_parser)
                     my_list.append([entry, [j]])
             if i in c:
@@ -10,11 +10,14 @@ import re
 # Interrupt parsing routines taken from python-linux-procfs (GPLv2)
 #
 
+_NATURAL_SORT_RE = re.compile("([0-9]+)")
+_REBOOT_RE = re.compile(r".*kernel: Linux version.*$")
+
 
 def natural_sort_key(s):
-    _nsre = re.compile("([0-9]+)")
     return [
-        int(text) if text.isdigit() else text.lower() for text in re.split(_nsre, s)
+        int(text) if text.isdigit() else text.lower()
+        for text in _NATURAL_SORT_RE.split(s)
     ]
 
 
@@ -105,7 +108,6 @@ class SosReport:
         # FIXME: uncompress any compressed messages files
         # FIXME: This is still potentially *very* fragile
         messages_dir = os.path.join(self.path, "var/log")
-        reboot_re = r".*kernel: Linux version.*$"
         files = [f for f in os.listdir(messages_dir) if f.startswith("messages")]
         for i in sorted(files, key=natural_sort_key, reverse=True):
             prev_month = None
@@ -113,7 +115,7 @@ class SosReport:
             with open(os.path.join(messages_dir, i)) as f:
                 for line in f.readlines():
                     line = line.strip()
-                    if not re.match(reboot_re, line):
+                    if not _REBOOT_RE.match(line):
                         continue
 
                     tokens = line.split()[0:3]
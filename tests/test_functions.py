@@ -17,7 +17,9 @@ import time
 import unittest
 
 from sar_grapher import SarGrapher
+from sar_parser import SarParser
 from sar_stats import SarStats
+import sar_metadata
 
 # To debug memory leaks
 USE_MELIAE = bool(os.getenv("USE_MELIAE", False))
@@ -121,5 +123,158 @@ class TestSarParsing(unittest.TestCase):
             )
 
 
+class TestSarMetadata(unittest.TestCase):
+    """Tests for the sar_metadata helpers"""
+
+    def test_data_line_regexp(self):
+        """Data line regexps are compiled once per set of headers"""
+        headers = ("CPU", "%user", "%system")
+        pattern = sar_metadata.data_line_regexp(headers)
+        self.assertIs(pattern, sar_metadata.data_line_regexp(headers))
+        matches = pattern.fullmatch("10:20:01 AM     0      1.50     0.25")
+        self.assertEqual(matches.groups(), ("10:20:01 AM", "0", "1.50", "0.25"))
+        self.assertIsNone(pattern.fullmatch("10:20:01 AM     0      1.50     x"))
+
+    def test_get_category(self):
+        """Categories come from the index column or from BASE_GRAPHS"""
+        self.assertEqual(sar_metadata.get_category("CPU#0#%idle"), "Load")
+        self.assertEqual(sar_metadata.get_category("IFACE#eth0#rxkB/s"), "Network")
+        self.assertEqual(sar_metadata.get_category("FAN"), "Power")
+        self.assertEqual(sar_metadata.get_category("ldavg-1"), "Load")
+        self.assertEqual(sar_metadata.get_category("i002/s"), "Interrupts")
+        self.assertEqual(sar_metadata.index_category("IFACE"), "Network")
+        self.assertEqual(
+            sar_metadata.index_category("DEV"),
+            sar_metadata.get_category("DEV#sda#tps"),
+        )
+
+    def test_graph_info_categories(self):
+        """Mixed categories are an error unless a name is a simple one"""
+        with self.assertRaises(Exception):
+            sar_metadata.graph_info(["CPU#0#%idle", "DEV#sda#%util"])
+        self.assertEqual(
+            sar_metadata.graph_info(["CPU#0#%idle", "DEV#sda#%util", "ldavg-1"]),
+            ("CPU#0#%idle", None, "CPU#0#%idle"),
+        )
+
+    def test_pressure_stall_graphs(self):
+        """Every pressure-stall family has one graph per window plus one over
+        the interval"""
+        for name in ("%scpu", "%smem", "%fmem", "%sio", "%fio"):
+            for suffix in ("-10", "-60", "-300", ""):
+                self.assertIn(name + suffix, sar_metadata.BASE_GRAPHS)
+        self.assertEqual(sar_metadata.BASE_GRAPHS["%fmem"]["cat"], "Memory")
+        self.assertEqual(sar_metadata.BASE_GRAPHS["%sio-60"]["unit"], "%")
+        self.assertEqual(
+            sar_metadata.get_desc(["%sio-60"]),
+            [
+                (
+                    "%sio-60",
+                    "Percentage of the time that at least some tasks lost "
+                    "waiting for I/O, over the last 60 second window.",
+                    None,
+                )
+            ],
+        )
+        self.assertEqual(
+            sar_metadata.get_desc(["%fmem"])[0][1],
+            "Percentage of the time during which all non-idle tasks were "
+            "stalled waiting for memory resources, over the last time "
+            "interval.",
+        )
+
+    def test_icmp_graphs(self):
+        """Every ICMP message type has a received and a sent counter"""
+        for name in ("ech", "echr", "tm", "tmr", "adrmk", "adrmkr", "dstunr",
+                     "tmex", "parmpb", "srcq", "redir"):
+            for prefix in ("i", "o"):
+                graph = sar_metadata.BASE_GRAPHS[prefix + name + "/s"]
+                self.assertEqual(graph["cat"], "Network")
+        self.assertEqual(
+            sar_metadata.get_desc(["iech/s"])[0][1],
+            "The number of ICMP Echo (request) messages received per second "
+            "[icmpInEchos]",
+        )
+        self.assertEqual(
+            sar_metadata.get_desc(["oredir/s"])[0][1],
+            "The number of ICMP Redirect messages sent per second "
+            "[icmpOutRedirects]",
+        )
+
+    def test_base_graphs_read_only(self):
+        """Neither the table nor its entries can be modified"""
+        with self.assertRaises(TypeError):
+            sar_metadata.BASE_GRAPHS["%idle"] = {}
+        with self.assertRaises(TypeError):
+            sar_metadata.BASE_GRAPHS["%idle"]["cat"] = "Memory"
+
+    def test_get_desc_many(self):
+        """Combined graphs get one description per kind of graph, in order
+        of first appearance"""
+        names = [
+            "CPU#0#%idle",
+            "CPU#0#%user",
+            "CPU#1#%idle",
+            "INTR#0#i000/s",
+            "CPU#1#%user",
+            "INTR#1#i001/s",
+        ]
+        descs = sar_metadata.get_desc(names)
+        self.assertEqual(
+            [(name, detail) for name, _, detail in descs],
+            [
+                ("%idle", "%idle [/proc/stat(4)]"),
+                ("%user", "%user - [/proc/stat(1)]"),
+                ("int/s", None),
+            ],
+        )
+        self.assertEqual(descs[0], sar_metadata.get_desc(["%idle"])[0])
+        self.assertEqual(descs[2][1], "Interrupts per second")
+        self.assertEqual(
+            [name for name, _, _ in sar_metadata.get_desc(
+                ["ldavg-1", "ldavg-5", "ldavg-1"])],
+            ["ldavg-1", "ldavg-5"],
+        )
+
+
+class TestSarParser(unittest.TestCase):
+    """Tests for the SarParser table handling"""
+
+    def setUp(self):
+        """A parser with no files behind it, dated like a sar file"""
+        self.parser = SarParser(["/nonexistent/sa/sar/files/sar01"])
+        self.parser._date = [2020, 1, 1]
+
+    def test_table_layout_etcp(self):
+        """The retrans/s column of the ETCP table is renamed to retrant/s"""
+        column, names, categories = self.parser._table_layout(
+            ["atmptf/s", "estres/s", "retrans/s", "isegerr/s", "orsts/s"]
+        )
+        self.assertIsNone(column)
+        self.assertEqual(
+            names, ["atmptf/s", "estres/s", "retrant/s", "isegerr/s", "orsts/s"]
+        )
+        self.assertEqual(categories, ["Network"] * 5)
+
+    def test_table_layout_indexed(self):
+        """Indexed tables report the position of their index column"""
+        column, names, categories = self.parser._table_layout(["CPU", "%user"])
+        self.assertEqual(column, 0)
+        self.assertEqual(names, ["CPU", "%user"])
+        self.assertEqual(categories, ["Load", "Load"])
+
+    def test_record_data_values(self):
+        """Numbers are stored as floats, anything else as the raw string"""
+        headers = ["i000/s", "i001/s"]
+        layout = self.parser._table_layout(headers)
+        matches = sar_metadata.data_line_regexp(tuple(headers)).fullmatch(
+            "10:00:01 AM       N/A      1.50"
+        )
+        timestamp = self.parser._record_data(layout, matches)
+        self.assertEqual(
+            self.parser._data[timestamp], {"i000/s": "N/A", "i001/s": 1.5}
+        )
+
+
 if __name__ == "__main__":
     unittest.main()